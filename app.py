@@ -1,11 +1,33 @@
 import streamlit as st
-import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import json
 import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
 import boto3
-from botocore.exceptions import ClientError
+import urllib3.exceptions
+from botocore.config import Config
+from botocore.exceptions import (
+    BotoCoreError,
+    ClientError,
+    ConnectionClosedError,
+    EndpointConnectionError,
+    HTTPClientError,
+    ReadTimeoutError,
+)
 from dotenv import load_dotenv
 
+# orjson parses the CMMC JSON exports several times faster than the stdlib;
+# fall back to json if it is not installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
@@ -13,33 +35,147 @@ load_dotenv()
 st.set_page_config(page_title="CMMC Objective Parser", layout="wide")
 
 # --- AWS Bedrock Setup ---
-@st.cache_resource
+# Shared botocore config: a large warm connection pool with TCP keep-alive
+# avoids per-call TLS handshakes (and NAT idle timeouts killing pooled
+# sockets) under concurrent sessions; adaptive retries back off on throttling.
+BEDROCK_CONFIG = Config(
+    max_pool_connections=100,
+    tcp_keepalive=True,
+    retries={"mode": "adaptive", "max_attempts": 5},
+    connect_timeout=3,
+    read_timeout=60,
+)
+
+# The clients live in a mutable cache_resource-held holder: Streamlit
+# re-executes this script in a fresh namespace on every rerun, so plain
+# module globals would be rebuilt each time, while the holder survives the
+# whole process and still lets stale-connection handling swap the clients
+# out in place. Both clients are built from the single shared Session below,
+# so the service-model load, endpoint resolver and credential resolution are
+# paid once per process even when a client is rebuilt.
+@st.cache_resource(show_spinner=False)
+def _get_client_holder():
+    """Process-wide holder for the Bedrock clients: a dict plus its lock."""
+    return {"runtime": None, "agent": None}, threading.Lock()
+
+@st.cache_resource(show_spinner=False)
+def _get_boto_session():
+    """One boto3 Session shared by both Bedrock clients, built once per
+    process: the service-model loader, endpoint resolver and resolved
+    credentials are paid for a single time and reused on every rebuild.
+    Credentials come from the default chain (the .env vars loaded above, or
+    an instance/task role)."""
+    return boto3.Session(region_name=os.getenv("AWS_REGION", "us-east-1"))
+
 def get_bedrock_clients():
-    """Initializes AWS Bedrock clients."""
+    """Returns the shared AWS Bedrock clients, creating them on first use."""
+    holder, lock = _get_client_holder()
+    if holder["runtime"] is None or holder["agent"] is None:
+        with lock:
+            if holder["runtime"] is None or holder["agent"] is None:
+                try:
+                    session = _get_boto_session()
+                    holder["runtime"] = session.client("bedrock-runtime", config=BEDROCK_CONFIG)
+                    holder["agent"] = session.client("bedrock-agent-runtime", config=BEDROCK_CONFIG)
+                except Exception as e:
+                    st.error(f"Failed to initialize AWS clients: {e}")
+                    return None, None
+    return holder["runtime"], holder["agent"]
+
+# Exceptions that indicate a dead pooled socket (NAT idle timeout, proxy RST)
+# rather than a bad request; the cached client must be rebuilt, not retried as-is.
+_STALE_CONNECTION_ERRORS = (
+    HTTPClientError,
+    ConnectionClosedError,
+    ReadTimeoutError,
+    EndpointConnectionError,
+    urllib3.exceptions.ProtocolError,
+    urllib3.exceptions.NewConnectionError,
+)
+
+def is_stale_connection_error(exc):
+    """Returns True if `exc` means the pooled HTTPS connection is unusable."""
+    if isinstance(exc, _STALE_CONNECTION_ERRORS):
+        return True
+    # urllib3 can surface internal state corruption as a bare AssertionError;
+    # treat it as stale only when it originates inside the HTTP stack.
+    if isinstance(exc, AssertionError):
+        tb = exc.__traceback__
+        while tb is not None and tb.tb_next is not None:
+            tb = tb.tb_next
+        if tb is not None:
+            module = tb.tb_frame.f_globals.get("__name__", "")
+            return module.startswith(("urllib3.", "botocore.", "boto3."))
+    return False
+
+def invalidate_bedrock_clients():
+    """Drops the cached Bedrock clients so the next call rebuilds them."""
+    holder, lock = _get_client_holder()
+    with lock:
+        holder["runtime"] = None
+        holder["agent"] = None
+
+def _with_stale_retry(call):
+    """
+    Invokes `call(bedrock_runtime, bedrock_agent_runtime)`, rebuilding the
+    clients and retrying exactly once if the connection pool looks poisoned.
+    """
     try:
-        session = boto3.Session(
-            aws_access_key_id=os.getenv("AWS_ACCESS_KEY_ID"),
-            aws_secret_access_key=os.getenv("AWS_SECRET_ACCESS_KEY"),
-            region_name=os.getenv("AWS_REGION", "us-east-1")
-        )
-        bedrock_runtime = session.client("bedrock-runtime")
-        bedrock_agent_runtime = session.client("bedrock-agent-runtime")
-        return bedrock_runtime, bedrock_agent_runtime
+        return call(*get_bedrock_clients())
     except Exception as e:
-        st.error(f"Failed to initialize AWS clients: {e}")
-        return None, None
+        if not is_stale_connection_error(e):
+            raise
+        invalidate_bedrock_clients()
+        runtime, agent = get_bedrock_clients()
+        if runtime is None or agent is None:
+            # The rebuild itself failed; surface the original connection
+            # error instead of letting the None clients raise AttributeError.
+            raise
+        return call(runtime, agent)
 
-bedrock_runtime, bedrock_agent_runtime = get_bedrock_clients()
 KB_ID = os.getenv("BEDROCK_KB_ID")
 MODEL_ID = os.getenv("BEDROCK_MODEL_ID", "anthropic.claude-3-haiku-20240307-v1:0")
 
+def _warm_up_bedrock():
+    """Issues a one-token converse so the first real request reuses an
+    already-established TLS connection and a warm model endpoint."""
+    try:
+        runtime, _ = get_bedrock_clients()
+        if runtime:
+            runtime.converse(
+                modelId=MODEL_ID,
+                messages=[{"role": "user", "content": [{"text": "ping"}]}],
+                inferenceConfig={"maxTokens": 1}
+            )
+    except Exception:
+        pass  # warm-up is best-effort; real calls surface their own errors
+
+@st.cache_resource
+def _start_bedrock_warmup():
+    """Kicks off the Bedrock warm-up once per process, on a daemon thread so
+    startup is never blocked on it."""
+    thread = threading.Thread(target=_warm_up_bedrock, name="bedrock-warmup", daemon=True)
+    thread.start()
+    return thread
+
+_start_bedrock_warmup()
+
 # --- Helper Functions ---
+@st.cache_data(ttl=300, show_spinner=False)
 def retrieve_from_kb(query, tier, intent):
     """
     Retrieves information from Bedrock Knowledge Base with metadata filters.
+
+    Results are cached for 5 minutes keyed on (query, tier, intent): repeated
+    or concurrent sessions asking the same question skip the KB round trip,
+    while the TTL keeps answers from outliving Knowledge Base re-syncs.
+    Failures raise instead of returning error strings — st.cache_data does
+    not cache exceptions, so a transient error is never replayed to other
+    sessions; callers format the user-facing message.
     """
+    _, bedrock_agent_runtime = get_bedrock_clients()
     if not bedrock_agent_runtime or not KB_ID:
-        return "Knowledge Base configuration missing."
+        raise RuntimeError("Knowledge Base configuration missing.")
 
     print(f"DEBUG: Querying KB with filters - Tier: {tier}, Intent: {intent}") # Debug log
 
@@ -75,26 +211,208 @@ def retrieve_from_kb(query, tier, intent):
         else:
             retrieval_config["vectorSearchConfiguration"]["filter"] = filter_conditions[0]
 
-    try:
-        response = bedrock_agent_runtime.retrieve(
-            knowledgeBaseId=KB_ID,
-            retrievalQuery={"text": query},
-            retrievalConfiguration=retrieval_config
+    response = _with_stale_retry(lambda _runtime, agent: agent.retrieve(
+        knowledgeBaseId=KB_ID,
+        retrievalQuery={"text": query},
+        retrievalConfiguration=retrieval_config
+    ))
+
+    results = []
+    for result in response.get("retrievalResults", []):
+        results.append(result.get("content", {}).get("text", ""))
+
+    return "\n\n".join(results) if results else "No relevant information found in Knowledge Base."
+
+# Upper bound on concurrent bedrock-agent-runtime.retrieve calls per request;
+# the pooled boto3 client is thread-safe, so these can overlap freely.
+_KB_MAX_PARALLEL_RETRIEVES = 4
+
+# One process-wide pool for KB retrievals, held in cache_resource so script
+# reruns reuse it rather than abandoning a fresh pool (and its idle threads)
+# every time. Streamlit scripts already run in worker threads, so submitting
+# here keeps the retrieve round trip off the script thread.
+@st.cache_resource(show_spinner=False)
+def _get_kb_executor():
+    """Returns the shared executor that runs all KB retrieve calls."""
+    return ThreadPoolExecutor(
+        max_workers=_KB_MAX_PARALLEL_RETRIEVES,
+        thread_name_prefix="kb-retrieve"
+    )
+
+# Ask-help answers are cached per user across the whole process; the app has
+# no login, so the selected organization ID stands in for the user. Entries
+# expire after 30 minutes so answers cannot outlive a KB re-sync forever (the
+# KB layer below uses a tighter 5-minute TTL).
+_ANSWER_CACHE_MAX_ENTRIES = 128
+_ANSWER_CACHE_TTL_SECONDS = 1800
+
+@st.cache_resource
+def _get_answer_cache():
+    """Process-wide LRU store of Ask-help answers, shared by all sessions."""
+    return OrderedDict(), threading.Lock()
+
+def _normalize_question(user_input):
+    """Collapses case and whitespace so trivially re-typed duplicates of a
+    question share one cache entry."""
+    return " ".join(user_input.lower().split())
+
+def get_cached_answer(org_id, user_input):
+    """Returns the cached (response_text, tier, intent) for this question,
+    refreshing its LRU position, or None on a miss or expired entry."""
+    cache, lock = _get_answer_cache()
+    key = (org_id, _normalize_question(user_input))
+    with lock:
+        entry = cache.get(key)
+        if entry is None:
+            return None
+        stored_at, answer = entry
+        if time.time() - stored_at > _ANSWER_CACHE_TTL_SECONDS:
+            del cache[key]
+            return None
+        cache.move_to_end(key)
+        return answer
+
+def store_cached_answer(org_id, user_input, response_text, tier, intent):
+    """Stores a finished Ask-help answer, evicting the least recently used
+    entry once the cache is full."""
+    cache, lock = _get_answer_cache()
+    key = (org_id, _normalize_question(user_input))
+    with lock:
+        cache[key] = (time.time(), (response_text, tier, intent))
+        cache.move_to_end(key)
+        while len(cache) > _ANSWER_CACHE_MAX_ENTRIES:
+            cache.popitem(last=False)
+
+class _TruncatedToolCallError(Exception):
+    """Raised when a streamed toolUse block ends with unparseable JSON."""
+
+def _drain_tool_stream(stream):
+    """
+    Consumes a converse_stream event stream, rebuilding the assistant message
+    from contentBlockStart/Delta/Stop events.
+
+    Returns (message, tool_uses) where tool_uses is the list of parsed
+    'search_knowledge_base' toolUse dicts in emission order.
+    """
+    content = []
+    current_block = None
+    tool_uses = []
+
+    for event in stream:
+        if "contentBlockStart" in event:
+            start = event["contentBlockStart"]["start"]
+            if "toolUse" in start:
+                current_block = {
+                    "toolUse": {
+                        "toolUseId": start["toolUse"]["toolUseId"],
+                        "name": start["toolUse"]["name"],
+                        "input": ""
+                    }
+                }
+        elif "contentBlockDelta" in event:
+            delta = event["contentBlockDelta"]["delta"]
+            if "text" in delta:
+                if current_block is None:
+                    current_block = {"text": ""}
+                current_block["text"] += delta["text"]
+            elif "toolUse" in delta and current_block and "toolUse" in current_block:
+                current_block["toolUse"]["input"] += delta["toolUse"]["input"]
+        elif "contentBlockStop" in event:
+            if current_block is None:
+                continue
+            if "toolUse" in current_block:
+                tool_use = current_block["toolUse"]
+                # The input can be truncated mid-JSON when the stream stops
+                # early (e.g. stopReason max_tokens during a tool call);
+                # surface that as a normal error instead of crashing the run.
+                try:
+                    tool_use["input"] = json.loads(tool_use["input"] or "{}")
+                except json.JSONDecodeError as e:
+                    raise _TruncatedToolCallError(
+                        f"the model emitted a truncated tool call: {e}"
+                    ) from e
+                if tool_use["name"] == "search_knowledge_base":
+                    tool_uses.append(tool_use)
+            content.append(current_block)
+            current_block = None
+
+    return {"role": "assistant", "content": content}, tool_uses
+
+def _tool_group_key(tool_input):
+    """Normalized (tier, intent) for one tool call. Stray whitespace must not
+    split a filter group or fork a cache entry; case is kept because the KB
+    metadata equals-filter is case-sensitive."""
+    tier = tool_input.get("tier")
+    intent = tool_input.get("intent")
+    return (
+        tier.strip() if isinstance(tier, str) else tier,
+        intent.strip() if isinstance(intent, str) else intent,
+    )
+
+def _dispatch_kb_retrievals(tool_uses):
+    """
+    Submits KB retrievals for a batch of toolUse blocks, merging queries that
+    share the same (tier, intent) filters into a single retrieve call —
+    related multi-facet questions then cost one KB round trip instead of one
+    per block. Distinct filter groups still run concurrently on the executor.
+
+    Returns (tool_use_id, tool_input, future) tuples in emission order;
+    blocks in the same filter group share one future.
+    """
+    grouped_queries = {}
+    tool_keys = []
+    for tool_use in tool_uses:
+        key = _tool_group_key(tool_use["input"])
+        tool_keys.append(key)
+        query = tool_use["input"].get("query")
+        if query:
+            # Lowercase and collapse whitespace so trivially re-worded
+            # queries share one retrieve call and one cache entry
+            grouped_queries.setdefault(key, []).append(" ".join(query.lower().split()))
+        else:
+            grouped_queries.setdefault(key, [])
+
+    group_futures = {}
+    for (tier, intent), queries in grouped_queries.items():
+        merged_query = "\n".join(dict.fromkeys(queries))
+        group_futures[(tier, intent)] = _get_kb_executor().submit(
+            retrieve_from_kb, merged_query, tier, intent
         )
-        
-        results = []
-        for result in response.get("retrievalResults", []):
-            results.append(result.get("content", {}).get("text", ""))
-        
-        return "\n\n".join(results) if results else "No relevant information found in Knowledge Base."
-        
-    except ClientError as e:
-        return f"Error querying Knowledge Base: {e}"
+
+    return [
+        (tool_use["toolUseId"], tool_use["input"], group_futures[key])
+        for tool_use, key in zip(tool_uses, tool_keys)
+    ]
+
+class _AnswerStream:
+    """
+    Iterable over final-answer text deltas. A mid-stream AWS failure is
+    rendered as a trailing error line and recorded on `failed`, so callers
+    can show the partial answer but skip caching it.
+    """
+    def __init__(self, events):
+        self._events = events
+        self.failed = False
+
+    def __iter__(self):
+        try:
+            for event in self._events:
+                delta = event.get("contentBlockDelta", {}).get("delta", {})
+                if "text" in delta:
+                    yield delta["text"]
+        except (ClientError, BotoCoreError) as e:
+            self.failed = True
+            yield f"\n\nError processing request: {e}"
 
 def chat_with_bedrock(user_input):
     """
     Orchestrates the LLM chat with function calling for KB retrieval.
+
+    Returns (answer_stream, tier, intent). `answer_stream` is a generator of
+    final-answer text deltas for incremental rendering, or a plain error
+    string when the request could not be started.
     """
+    bedrock_runtime, _ = get_bedrock_clients()
     if not bedrock_runtime:
         return "AWS Bedrock client not initialized.", None, None
 
@@ -127,88 +445,140 @@ def chat_with_bedrock(user_input):
     messages = [{"role": "user", "content": [{"text": user_input}]}]
 
     try:
-        # 1. Initial Call to Model (to trigger tool use)
-        response = bedrock_runtime.converse(
+        # 1. Initial Call to Model (to trigger tool use), streamed so tool
+        # dispatch can start before the model finishes generating.
+        response = _with_stale_retry(lambda runtime, _agent: runtime.converse_stream(
             modelId=MODEL_ID,
             messages=messages,
             system=system_prompts,
             toolConfig=tool_config
-        )
-        
-        output_message = response['output']['message']
-        messages.append(output_message)
-        
+        ))
+
         inferred_tier = None
         inferred_intent = None
 
-        # 2. Process Tool Requests
-        if 'content' in output_message:
-            for content_block in output_message['content']:
-                if 'toolUse' in content_block:
-                    tool_use = content_block['toolUse']
-                    tool_name = tool_use['name']
-                    tool_use_id = tool_use['toolUseId']
-                    
-                    if tool_name == 'search_knowledge_base':
-                        tool_input = tool_use['input']
-                        query = tool_input.get('query')
-                        inferred_tier = tool_input.get('tier')
-                        inferred_intent = tool_input.get('intent')
-                        
-                        # Execute the tool
-                        tool_result = retrieve_from_kb(query, inferred_tier, inferred_intent)
-                        
-                        # Add tool result to messages
-                        tool_result_message = {
-                            "role": "user",
-                            "content": [
-                                {
-                                    "toolResult": {
-                                        "toolUseId": tool_use_id,
-                                        "content": [{"json": {"result": tool_result}}]
-                                    }
-                                }
-                            ]
-                        }
-                        messages.append(tool_result_message)
+        # 2. Drain the stream, then dispatch KB retrievals. toolUse blocks
+        # stream at the tail of the assistant message, so dispatching after
+        # the drain costs a few events at most, and batching lets same-filter
+        # queries share one retrieve call. tool_calls preserves emission
+        # order so toolResults line up with their toolUseIds.
+        output_message, tool_uses = _drain_tool_stream(response["stream"])
+        messages.append(output_message)
+        tool_calls = _dispatch_kb_retrievals(tool_uses)
 
-        # 3. Final Call to Model (to generate answer with tool results)
-        final_response = bedrock_runtime.converse(
+        tool_result_content = []
+        for tool_use_id, tool_input, future in tool_calls:
+            inferred_tier = tool_input.get('tier')
+            inferred_intent = tool_input.get('intent')
+            try:
+                tool_result = future.result()
+            except (ClientError, BotoCoreError, RuntimeError) as e:
+                # KB failures degrade to an error string in this tool result
+                # only; retrieve_from_kb raises so st.cache_data never caches
+                # the failure for other sessions
+                tool_result = f"Error querying Knowledge Base: {e}"
+            tool_result_content.append({
+                "toolResult": {
+                    "toolUseId": tool_use_id,
+                    "content": [{"json": {"result": tool_result}}]
+                }
+            })
+
+        if tool_result_content:
+            messages.append({"role": "user", "content": tool_result_content})
+
+        # 3. Final Call to Model (to generate answer with tool results),
+        # streamed so the caller can render tokens as they arrive.
+        final_response = _with_stale_retry(lambda runtime, _agent: runtime.converse_stream(
             modelId=MODEL_ID,
             messages=messages,
             system=system_prompts,
             toolConfig=tool_config
-        )
-        
-        final_text = final_response['output']['message']['content'][0]['text']
-        return final_text, inferred_tier, inferred_intent
+        ))
+
+        return _AnswerStream(final_response["stream"]), inferred_tier, inferred_intent
 
-    except ClientError as e:
+    except (ClientError, BotoCoreError, _TruncatedToolCallError) as e:
         return f"Error processing request: {e}", None, None
 
+def _read_json(path):
+    """Parses one JSON file, using orjson when available."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def _load_table(json_path):
+    """
+    Loads one CMMC table as a list of row dicts, preferring a Parquet sidecar
+    over the JSON export.
+
+    The first start parses the JSON and writes <name>.parquet next to it;
+    later starts read the Parquet file instead, which skips JSON parsing
+    entirely unless the export has been refreshed since the cache was written.
+    """
+    parquet_path = os.path.splitext(json_path)[0] + '.parquet'
+    try:
+        if os.path.getmtime(parquet_path) >= os.path.getmtime(json_path):
+            return pq.read_table(parquet_path).to_pylist()
+    except OSError:
+        pass
+
+    records = _read_json(json_path)
+    try:
+        pq.write_table(pa.Table.from_pylist(records), parquet_path)
+    except (OSError, pa.ArrowInvalid):
+        pass  # cache write is best-effort; the parsed records are still usable
+    return records
+
 # --- Data Loading ---
 @st.cache_data
 def load_data():
-    """Loads CMMC data from JSON files."""
+    """Loads CMMC data from JSON files, reading the three files in parallel.
+
+    Each table is a plain list of row dicts: this read-only UI metadata only
+    ever gets iterated and indexed, so DataFrames added import and
+    construction cost without buying any vectorized work.
+    """
     try:
         # Get the directory of the current script
         base_dir = os.path.dirname(os.path.abspath(__file__))
-        
-        with open(os.path.join(base_dir, 'cmmc-practices.json'), 'r') as f:
-            practices = json.load(f)
-        
-        with open(os.path.join(base_dir, 'cmmc-objectives.json'), 'r') as f:
-            objectives = json.load(f)
-            
-        with open(os.path.join(base_dir, 'cmmc-assessments.json'), 'r') as f:
-            assessments = json.load(f)
-            
-        return pd.DataFrame(practices), pd.DataFrame(objectives), pd.DataFrame(assessments)
+        paths = [
+            os.path.join(base_dir, name)
+            for name in ('cmmc-practices.json', 'cmmc-objectives.json', 'cmmc-assessments.json')
+        ]
+
+        with ThreadPoolExecutor(max_workers=len(paths)) as executor:
+            practices, objectives, assessments = executor.map(_load_table, paths)
+
+        return practices, objectives, assessments
     except FileNotFoundError as e:
         st.error(f"Error loading data files: {e}")
-        return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
+        return [], [], []
 
-df_practices, df_objectives, df_assessments = load_data()
+practices, objectives, assessments = load_data()
+
+@st.cache_data
+def build_practice_lookup(practices):
+    """Builds the practice selectbox labels; positions line up with the
+    practice rows, so a selected index resolves its row in O(1)."""
+    return [f"{row['practice_id']} - {row['title']}" for row in practices]
+
+@st.cache_data
+def build_objective_groups(objectives):
+    """Groups objective selectbox labels by practice UUID once, so reruns do
+    a dict lookup instead of re-scanning the objectives table."""
+    groups = {}
+    for row in objectives:
+        groups.setdefault(row['practice_id'], []).append(
+            f"{row['objective_code']} - {row['objective_text']}"
+        )
+    return groups
+
+@st.cache_data
+def get_org_ids(assessments):
+    """Unique organization IDs from the assessments table, computed once
+    instead of on every rerun."""
+    return list(dict.fromkeys(row['org_id'] for row in assessments))
 
 # --- UI Layout ---
 
@@ -221,8 +591,8 @@ with col1:
 with col2:
     # "Org-id (dropdown)"
     # We extract unique Org IDs from the assessments table
-    if not df_assessments.empty:
-        org_ids = df_assessments['org_id'].unique().tolist()
+    if assessments:
+        org_ids = get_org_ids(assessments)
         selected_org_id = st.selectbox("Organization ID", org_ids)
     else:
         st.warning("No Assessment Data Found")
@@ -231,62 +601,90 @@ with col2:
 st.divider()
 
 # Main Content Area
-if not df_practices.empty and not df_objectives.empty:
-    
+if practices and objectives:
+
     # 1. Practice Selection
-    # Format: "ID - Title" for readability
-    practice_options = df_practices.apply(
-        lambda x: f"{x['practice_id']} - {x['title']}", axis=1
-    ).tolist()
-    
-    selected_practice_str = st.selectbox("Select Practice", practice_options)
-    
-    # Extract the practice_id string (e.g., "AC.L2-3.1.1") to filter objectives
-    # We also need the internal UUID for the foreign key relationship
-    if selected_practice_str:
-        # Find the row corresponding to the selection
-        selected_practice_row = df_practices[
-            df_practices.apply(lambda x: f"{x['practice_id']} - {x['title']}", axis=1) == selected_practice_str
-        ].iloc[0]
+    # Format: "ID - Title" for readability. Options are row indices rendered
+    # through format_func, so the widget state carries a small int instead of
+    # the full label string on every rerun.
+    practice_options = build_practice_lookup(practices)
+
+    selected_practice_idx = st.selectbox(
+        "Select Practice",
+        range(len(practice_options)),
+        format_func=lambda i: practice_options[i]
+    )
+
+    selected_practice_str = None
+
+    # We need the internal UUID for the foreign key relationship
+    if selected_practice_idx is not None:
+        selected_practice_str = practice_options[selected_practice_idx]
+        selected_practice_row = practices[selected_practice_idx]
         
         practice_uuid = selected_practice_row['id']
-        
+
         # 2. Objective Selection
-        # Filter objectives based on the selected practice UUID
-        filtered_objectives = df_objectives[df_objectives['practice_id'] == practice_uuid]
-        
-        if not filtered_objectives.empty:
-            objective_options = filtered_objectives.apply(
-                lambda x: f"{x['objective_code']} - {x['objective_text']}", axis=1
-            ).tolist()
-            selected_objective_str = st.selectbox("Select Objective", objective_options)
+        # Look up the pre-grouped objectives for the selected practice UUID
+        objective_options = build_objective_groups(objectives).get(practice_uuid, [])
+
+        if objective_options:
+            selected_objective_idx = st.selectbox(
+                "Select Objective",
+                range(len(objective_options)),
+                format_func=lambda i: objective_options[i]
+            )
+            selected_objective_str = objective_options[selected_objective_idx]
         else:
             st.info("No objectives found for this practice.")
             selected_objective_str = None
 
-    # 3. User Question/Input
-    user_input = st.text_input("User Question / Input", placeholder="Enter your question or input here...")
+    # 3-5. Question input, buttons and AI output run as a fragment: button
+    # clicks rerun only this block, so the Bedrock/KB round trip doesn't
+    # replay the data loading and selectbox logic above.
+    @st.fragment
+    def ask_and_validate_section(selected_practice_str, selected_org_id):
+        # User Question/Input
+        user_input = st.text_input("User Question / Input", placeholder="Enter your question or input here...")
 
-    # 4. Buttons
-    btn_col1, btn_col2 = st.columns(2)
-    
-    with btn_col1:
-        ask_help = st.button("Ask help", use_container_width=True)
-        
-    with btn_col2:
-        validate = st.button("Validate", use_container_width=True)
-
-    # 5. Answer/Output
-    if ask_help:
-        with st.spinner("Analyzing with Bedrock AI..."):
-            response_text, tier, intent = chat_with_bedrock(user_input)
-            
-            st.markdown("### AI Analysis")
-            st.markdown(f"**Inferred Tier:** `{tier}` | **Inferred Intent:** `{intent}`")
-            st.info(response_text)
-        
-    if validate:
-        st.success(f"**Validation**: Input '{user_input}' validated against '{selected_practice_str}'.")
+        # Buttons
+        btn_col1, btn_col2 = st.columns(2)
+
+        with btn_col1:
+            ask_help = st.button("Ask help", use_container_width=True)
+
+        with btn_col2:
+            validate = st.button("Validate", use_container_width=True)
+
+        # Answer/Output
+        if ask_help:
+            cached = get_cached_answer(selected_org_id, user_input)
+            if cached is not None:
+                response_text, tier, intent = cached
+                st.markdown("### AI Analysis")
+                st.markdown(f"**Inferred Tier:** `{tier}` | **Inferred Intent:** `{intent}`")
+                st.markdown(response_text)
+            else:
+                with st.spinner("Analyzing with Bedrock AI..."):
+                    answer_stream, tier, intent = chat_with_bedrock(user_input)
+
+                    st.markdown("### AI Analysis")
+                    st.markdown(f"**Inferred Tier:** `{tier}` | **Inferred Intent:** `{intent}`")
+                    if isinstance(answer_stream, str):
+                        st.info(answer_stream)
+                    else:
+                        # st.write_stream renders tokens as they arrive and
+                        # returns the full text once the stream is exhausted
+                        response_text = st.write_stream(answer_stream)
+                        # Only cache answers that streamed to completion; a
+                        # mid-stream failure must not be replayed on later asks
+                        if not answer_stream.failed:
+                            store_cached_answer(selected_org_id, user_input, response_text, tier, intent)
+
+        if validate:
+            st.success(f"**Validation**: Input '{user_input}' validated against '{selected_practice_str}'.")
+
+    ask_and_validate_section(selected_practice_str, selected_org_id)
 
 else:
     st.error("Data could not be loaded. Please ensure JSON files are in the same directory.")